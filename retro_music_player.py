@@ -2,16 +2,19 @@ import sys
 import os
 import random
 import logging
+import functools
+import queue
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+import threading
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QLabel, QPushButton, QSlider, 
                              QFileDialog, QListWidget, QMessageBox, QProgressBar)
-from PyQt5.QtGui import QFont, QIcon, QPalette, QColor, QPixmap, QDragEnterEvent, QDropEvent
-from PyQt5.QtCore import Qt, QTimer, QUrl, pyqtSignal
+from PyQt5.QtGui import QFont, QIcon, QPalette, QColor, QImage, QPixmap, QPixmapCache, QDragEnterEvent, QDropEvent
+from PyQt5.QtCore import Qt, QEvent, QTimer, QUrl, pyqtSignal, QObject, QRunnable, QThreadPool
 import pygame
 from pygame import mixer
-import sounddevice as sd
-import soundfile as sf
 import numpy as np
+import mutagen
 from mutagen.mp3 import MP3
 from mutagen.easyid3 import EasyID3
 from mutagen.flac import FLAC
@@ -19,13 +22,452 @@ from mutagen.oggvorbis import OggVorbis
 from mutagen.id3 import APIC
 import json
 
-# Set up logging
-logging.basicConfig(filename='player_errors.log', level=logging.ERROR,
-                    format='%(asctime)s - %(levelname)s - %(message)s')
+# Set up logging: records go through a queue so error paths never block on disk,
+# and main() runs the listener that writes them to a size-capped rotating file
+_log_queue = queue.Queue(-1)
+_log_file_handler = RotatingFileHandler('player_errors.log', maxBytes=1_000_000, backupCount=3, delay=True)
+_log_file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+_log_listener = QueueListener(_log_queue, _log_file_handler)
+logging.basicConfig(level=logging.ERROR, handlers=[QueueHandler(_log_queue)])
+
+_READERS = {'.mp3': EasyID3, '.flac': FLAC, '.ogg': OggVorbis}
+
+
+@functools.lru_cache(maxsize=2048)
+def _read_title(file, mtime):
+    # mtime is only part of the cache key, so a retagged file is read again
+    reader = _READERS.get(os.path.splitext(file)[1].lower())
+    return reader(file).get('title', [os.path.basename(file)])[0] if reader else os.path.basename(file)
+
+THEMES = {
+    "80s_neon": {
+        "bg_color": "#1A1A2E", "text_color": "#00FFCC", "btn_bg": "#2E2E4A",
+        "btn_border": "#00FFCC", "hover_bg": "#00FFCC", "hover_text": "#2E2E4A"
+    },
+    "90s_crt": {
+        "bg_color": "#2A2A3A", "text_color": "#FFD700", "btn_bg": "#4A2C2A",
+        "btn_border": "#FFD700", "hover_bg": "#FFD700", "hover_text": "#4A2C2A"
+    }
+}
+
+STYLE_TEMPLATE = """
+QMainWindow {{
+    background-color: {bg_color};
+    color: {text_color};
+    border: 3px solid {btn_border};
+}}
+QPushButton {{
+    background-color: {btn_bg};
+    color: {text_color};
+    border: 3px solid {btn_border};
+    padding: 12px;
+    font-family: 'VT323', monospace;
+    font-size: 16px;
+    text-transform: uppercase;
+}}
+QPushButton:hover {{
+    background-color: {hover_bg};
+    color: {hover_text};
+}}
+QLabel {{
+    color: {text_color};
+    font-family: 'VT323', monospace;
+    font-size: 18px;
+}}
+QSlider::handle:horizontal {{
+    background: {text_color};
+    width: 20px;
+    margin: -6px 0;
+    border-radius: 10px;
+    border: 2px solid {btn_bg};
+}}
+QSlider::groove:horizontal {{
+    background: {btn_bg};
+    height: 12px;
+    border: 2px solid {btn_border};
+}}
+QProgressBar {{
+    background-color: {btn_bg};
+    border: 2px solid {btn_border};
+    height: 12px;
+}}
+QProgressBar::chunk {{
+    background-color: {text_color};
+}}
+QListWidget {{
+    background-color: {bg_color};
+    color: {text_color};
+    border: 2px solid {btn_border};
+    font-family: 'VT323', monospace;
+    font-size: 16px;
+}}
+"""
+
+# Centre frequencies (Hz) of the bass, mid and treble peaking filters
+EQ_BANDS = (100.0, 1000.0, 8000.0)
+EQ_Q = 0.707
+
+
+def peaking_eq_sos(samplerate, center, gain_db, q=EQ_Q):
+    """RBJ cookbook peaking-EQ biquad, returned as a single normalised SOS row."""
+    a = 10 ** (gain_db / 40.0)
+    w0 = 2 * np.pi * min(center, 0.45 * samplerate) / samplerate
+    alpha = np.sin(w0) / (2 * q)
+    cos_w0 = np.cos(w0)
+    a0 = 1 + alpha / a
+    return np.array([[(1 + alpha * a) / a0, -2 * cos_w0 / a0, (1 - alpha * a) / a0,
+                      1.0, -2 * cos_w0 / a0, (1 - alpha / a) / a0]])
+
+
+def biquad_cascade(x, sos, zi):
+    """Filter x (frames, channels) in place through the SOS cascade, updating zi.
+
+    Transposed direct form II with the same zi layout as scipy's sosfilt.
+    """
+    for s in range(sos.shape[0]):
+        b0, b1, b2 = sos[s, 0], sos[s, 1], sos[s, 2]
+        a1, a2 = sos[s, 4], sos[s, 5]
+        for c in range(x.shape[1]):
+            z0 = zi[s, 0, c]
+            z1 = zi[s, 1, c]
+            for n in range(x.shape[0]):
+                xn = x[n, c]
+                yn = b0 * xn + z0
+                z0 = b1 * xn - a1 * yn + z1
+                z1 = b2 * xn - a2 * yn
+                x[n, c] = yn
+            zi[s, 0, c] = z0
+            zi[s, 1, c] = z1
+
+
+# PortAudio, libsndfile and numba are slow to load, so they're only imported
+# once something is actually streamed; pygame-only sessions never pay for them
+sd = None
+sf = None
+_biquad_kernel = None
+
+
+def _load_audio_engine():
+    global sd, sf, _biquad_kernel
+    if _biquad_kernel is not None:
+        return
+    import sounddevice
+    import soundfile
+    from numba import njit
+    sd, sf = sounddevice, soundfile
+    kernel = njit(cache=True, fastmath=True)(biquad_cascade)
+    # Compile now rather than inside the first audio callback
+    kernel(np.zeros((1, 1), dtype='float32'), np.zeros((1, 6)), np.zeros((1, 2, 1)))
+    _biquad_kernel = kernel
+
+
+class TrackDecoder:
+    """Decodes a file ahead of playback into a ring buffer on a background thread.
+
+    The audio callback only copies out of the ring, so a slow disk read can't
+    stall it; the decoder keeps up to RING_SECONDS of audio buffered.
+    """
+
+    BLOCK_FRAMES = 4096
+    RING_SECONDS = 2
+
+    def __init__(self, path):
+        _load_audio_engine()
+        self.path = path
+        self._sf = sf.SoundFile(path)
+        self.samplerate = self._sf.samplerate
+        self.channels = self._sf.channels
+        self.frames = self._sf.frames
+        self._ring = np.zeros((self.samplerate * self.RING_SECONDS, self.channels), dtype='float32')
+        self._wr = 0  # total frames written into the ring
+        self._rd = 0  # total frames copied out of the ring
+        self._pos = 0  # file frame the next copied-out frame belongs to
+        self._eof = False
+        self._seek_to = None
+        self._closed = False
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        size = len(self._ring)
+        try:
+            while not self._closed:
+                with self._lock:
+                    seek_to, self._seek_to = self._seek_to, None
+                    free = size - (self._wr - self._rd)
+                if seek_to is not None:
+                    self._sf.seek(seek_to)
+                    with self._lock:
+                        # Drop everything decoded before the seek
+                        self._rd = self._wr
+                        self._pos = seek_to
+                        self._eof = False
+                    continue
+                if self._eof or free < self.BLOCK_FRAMES:
+                    self._wake.wait(0.05)
+                    self._wake.clear()
+                    continue
+                block = self._sf.read(self.BLOCK_FRAMES, dtype='float32', always_2d=True)
+                start = self._wr % size
+                first = min(len(block), size - start)
+                self._ring[start:start + first] = block[:first]
+                self._ring[:len(block) - first] = block[first:]
+                with self._lock:
+                    self._wr += len(block)
+                    self._eof = len(block) < self.BLOCK_FRAMES
+        except Exception as e:
+            logging.error(f"Decode error for {self.path}: {str(e)}")
+            with self._lock:
+                # Let the callback drain what's buffered and then stop the stream
+                self._eof = True
+        finally:
+            self._sf.close()
+
+    def read_into(self, out):
+        """Copy up to len(out) buffered frames into out and return how many were copied."""
+        size = len(self._ring)
+        with self._lock:
+            n = min(len(out), self._wr - self._rd)
+            start = self._rd % size
+            first = min(n, size - start)
+            out[:first] = self._ring[start:start + first]
+            out[first:n] = self._ring[:n - first]
+            self._rd += n
+            self._pos += n
+        self._wake.set()
+        return n
+
+    @property
+    def finished(self):
+        with self._lock:
+            return self._eof and self._wr == self._rd
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, frame):
+        # mutagen's length can overshoot what libsndfile decodes (VBR, encoder delay)
+        frame = min(max(frame, 0), self.frames)
+        with self._lock:
+            self._seek_to = frame
+            self._pos = frame
+        self._wake.set()
+
+    def close(self):
+        self._closed = True
+        self._wake.set()
+
+
+class StreamBackend:
+    """Streams a track through sounddevice so the equalizer can filter the samples."""
+
+    # Containers libsndfile has no decoder for; these always go through pygame
+    UNDECODABLE_FORMATS = frozenset({'.aac', '.wma', '.m4a'})
+
+    def __init__(self):
+        self._decoder = None
+        self._incoming = None  # decoder being faded in during a crossfade
+        self._xfade_frames = 0
+        self._xfade_pos = 0
+        self._stream = None
+        self._volume = 0.5
+        self._gains = (0.0, 0.0, 0.0)
+        self._sos = None
+        self._zi = None
+        self._finished = False
+
+    def load(self, path):
+        self.stop()
+        self._decoder = TrackDecoder(path)
+        self._zi = np.zeros((len(EQ_BANDS), 2, self._decoder.channels))
+        self._build_sos()
+        self._finished = False
+        try:
+            self._stream = sd.OutputStream(callback=self._audio_cb, samplerate=self._decoder.samplerate,
+                                           channels=self._decoder.channels, dtype='float32')
+        except Exception:
+            # Don't leave the decoder thread running without a stream to feed
+            self.stop()
+            raise
+
+    def crossfade_to(self, path, seconds):
+        """Fade from the playing track into path; returns False if a crossfade isn't possible."""
+        if not self.get_busy() or self._incoming is not None or seconds <= 0:
+            return False
+        if os.path.splitext(path)[1].lower() in self.UNDECODABLE_FORMATS:
+            return False
+        try:
+            decoder = TrackDecoder(path)
+        except Exception as e:
+            # The caller falls back to a hard switch, which logs if the track can't stream at all
+            logging.info(f"Crossfade decoder error for {path}: {str(e)}")
+            return False
+        # Both tracks share one output stream, so they must agree on its format
+        if (decoder.samplerate, decoder.channels) != (self._decoder.samplerate, self._decoder.channels):
+            decoder.close()
+            return False
+        self._xfade_frames = max(1, int(seconds * decoder.samplerate))
+        self._xfade_pos = 0
+        self._incoming = decoder
+        return True
+
+    def play(self):
+        self._stream.start()
+
+    def pause(self):
+        if self._stream:
+            self._stream.stop()
+
+    def unpause(self):
+        if self._stream and not self._finished:
+            self._stream.start()
+
+    def stop(self):
+        if self._stream:
+            self._stream.close()
+            self._stream = None
+        for decoder in (self._decoder, self._incoming):
+            if decoder:
+                decoder.close()
+        self._decoder = None
+        self._incoming = None
+
+    def set_volume(self, volume):
+        self._volume = volume
+
+    def set_eq(self, bass, mid, treble):
+        self._gains = (bass, mid, treble)
+        self._build_sos()
+
+    def _build_sos(self):
+        if self._decoder:
+            samplerate = self._decoder.samplerate
+            # Swap in a fresh array so the audio callback never sees a half-written one
+            self._sos = np.vstack([peaking_eq_sos(samplerate, center, gain)
+                                   for center, gain in zip(EQ_BANDS, self._gains)])
+
+    def get_busy(self):
+        return self._stream is not None and self._stream.active and not self._finished
+
+    def is_idle(self):
+        # Nothing loaded or the track ran out; unlike get_busy(), a paused track is not idle
+        return self._stream is None or self._finished
+
+    def _current(self):
+        # Once a crossfade starts, position and seeks refer to the incoming track
+        return self._incoming or self._decoder
+
+    def get_pos(self):
+        decoder = self._current()
+        return decoder.tell() / decoder.samplerate if decoder else 0.0
+
+    def set_pos(self, seconds):
+        decoder = self._current()
+        if decoder:
+            decoder.seek(int(seconds * decoder.samplerate))
+            self._zi.fill(0)
+
+    def _audio_cb(self, outdata, frames, time, status):
+        n = self._decoder.read_into(outdata)
+        # A short read before EOF is an underrun: pad with silence and keep going
+        outdata[n:] = 0
+        if self._incoming is not None:
+            self._mix_incoming(outdata, frames)
+            n = frames
+        _biquad_kernel(outdata, self._sos, self._zi)
+        outdata *= self._volume
+        if n < frames and self._decoder.finished:
+            self._finished = True
+            raise sd.CallbackStop
+
+    def _mix_incoming(self, outdata, frames):
+        incoming = self._incoming
+        block = np.empty_like(outdata)
+        m = incoming.read_into(block)
+        block[m:] = 0
+        # Equal-power ramp: cos/sin gains keep perceived loudness constant across the fade
+        t = np.minimum((self._xfade_pos + np.arange(frames)) / self._xfade_frames, 1.0) * (np.pi / 2)
+        outdata *= np.cos(t)[:, None]
+        outdata += block * np.sin(t)[:, None]
+        self._xfade_pos += frames
+        if self._xfade_pos >= self._xfade_frames:
+            self._decoder.close()
+            self._decoder = incoming
+            self._incoming = None
+
+
+class PygameBackend:
+    """Plays through pygame.mixer.music for files libsndfile can't decode (no EQ)."""
+
+    def __init__(self):
+        # mixer.music.get_pos() counts time since play(), ignoring set_pos() jumps
+        self._seek_offset = 0.0
+
+    def load(self, path):
+        mixer.music.load(path)
+        self._seek_offset = 0.0
+
+    def play(self):
+        mixer.music.play()
+        self._seek_offset = 0.0
+
+    def pause(self):
+        mixer.music.pause()
+
+    def unpause(self):
+        mixer.music.unpause()
+
+    def stop(self):
+        mixer.music.stop()
+
+    def set_volume(self, volume):
+        mixer.music.set_volume(volume)
+
+    def set_eq(self, bass, mid, treble):
+        pass
+
+    def get_busy(self):
+        return mixer.music.get_busy()
+
+    def is_idle(self):
+        return mixer.music.get_pos() == -1
+
+    def get_pos(self):
+        return mixer.music.get_pos() / 1000.0 + self._seek_offset
+
+    def set_pos(self, seconds):
+        mixer.music.set_pos(seconds)
+        self._seek_offset = seconds - mixer.music.get_pos() / 1000.0
+
+
+class MetaSignals(QObject):
+    loaded = pyqtSignal(str, float, str, object)  # path, length, title, scaled art QImage
+
+
+class MetaWorker(QRunnable):
+    """Parses a track's tags on the global thread pool and reports back via signals."""
+
+    def __init__(self, path, reader, signals):
+        super().__init__()
+        self.path = path
+        self.reader = reader
+        self.signals = signals
+
+    def run(self):
+        meta = self.reader(self.path)
+        self.signals.loaded.emit(self.path, float(meta['length']), meta['title'], meta['art'])
+
 
 class RetroMusicPlayer(QMainWindow):
-    SUPPORTED_FORMATS = ['.mp3', '.wav', '.flac', '.ogg', '.aac', '.wma', '.m4a', '.aiff', '.opus']
+    SUPPORTED_FORMATS = frozenset({'.mp3', '.wav', '.flac', '.ogg', '.aac', '.wma', '.m4a', '.aiff', '.opus'})
+    _FORMATS_FILTER = "Audio Files (" + " ".join(f"*{fmt}" for fmt in sorted(SUPPORTED_FORMATS)) + ")"
+    EQUALIZER_INTERVAL_MS = 150
+    VISUALIZER_INTERVAL_MS = 66  # ~15 Hz is plenty for a cosmetic display
     update_progress_signal = pyqtSignal(float)
+    # Formatted once at import; switching themes is then a single setStyleSheet call
+    _compiled_styles = {name: STYLE_TEMPLATE.format(**colors) for name, colors in THEMES.items()}
 
     def __init__(self):
         super().__init__()
@@ -39,85 +481,44 @@ class RetroMusicPlayer(QMainWindow):
         self.current_track_index = 0
         self.is_playing = False
         self.is_shuffled = False
+        self._shuffle_order = []  # permutation of playlist indices walked in shuffle mode
+        self._shuffle_idx = 0
         self.is_repeated = False
         self.crossfade_duration = 2.0  # Seconds
-        
+        self._meta_cache = {}  # path -> {'length', 'title', 'art'}
+        self._pending_rows = {}  # path -> playlist rows still showing the loading placeholder
+        self._meta_signals = MetaSignals()
+        self._meta_signals.loaded.connect(self._on_meta_loaded)
+        self._cur_length = 0.0
+        self._cur_title = ""
+        self._cur_total_str = "0s"
+        self._rng = np.random.default_rng()
+        self._bar_strings = ["█" * height for height in range(11)]
+        self._last_eq_str = None
+        self._last_vis_str = None
+        
+        QPixmapCache.setCacheLimit(20 * 1024)  # KB
         pygame.mixer.init()
+        self._stream_backend = StreamBackend()
+        self._pygame_backend = PygameBackend()
+        self._backend = self._pygame_backend
         self.progress_timer = QTimer(self)
         self.progress_timer.timeout.connect(self.update_progress)
         self.equalizer_timer = QTimer(self)
         self.equalizer_timer.timeout.connect(self.update_equalizer)
         self.visualizer_timer = QTimer(self)
         self.visualizer_timer.timeout.connect(self.update_visualizer)
+        # Coalesce slider drags so EQ coefficients are rebuilt at most every 30 ms
+        self._eq_debounce = QTimer(self)
+        self._eq_debounce.setSingleShot(True)
+        self._eq_debounce.setInterval(30)
+        self._eq_debounce.timeout.connect(self._apply_eq)
         
         self.init_ui()
         self.setup_shortcuts()
         
     def setup_style(self, theme):
-        themes = {
-            "80s_neon": {
-                "bg_color": "#1A1A2E", "text_color": "#00FFCC", "btn_bg": "#2E2E4A",
-                "btn_border": "#00FFCC", "hover_bg": "#00FFCC", "hover_text": "#2E2E4A"
-            },
-            "90s_crt": {
-                "bg_color": "#2A2A3A", "text_color": "#FFD700", "btn_bg": "#4A2C2A",
-                "btn_border": "#FFD700", "hover_bg": "#FFD700", "hover_text": "#4A2C2A"
-            }
-        }
-        theme_colors = themes.get(theme, themes["80s_neon"])
-        
-        self.setStyleSheet(f"""
-            QMainWindow {{
-                background-color: {theme_colors['bg_color']};
-                color: {theme_colors['text_color']};
-                border: 3px solid {theme_colors['btn_border']};
-            }}
-            QPushButton {{
-                background-color: {theme_colors['btn_bg']};
-                color: {theme_colors['text_color']};
-                border: 3px solid {theme_colors['btn_border']};
-                padding: 12px;
-                font-family: 'VT323', monospace;
-                font-size: 16px;
-                text-transform: uppercase;
-            }}
-            QPushButton:hover {{
-                background-color: {theme_colors['hover_bg']};
-                color: {theme_colors['hover_text']};
-            }}
-            QLabel {{
-                color: {theme_colors['text_color']};
-                font-family: 'VT323', monospace;
-                font-size: 18px;
-            }}
-            QSlider::handle:horizontal {{
-                background: {theme_colors['text_color']};
-                width: 20px;
-                margin: -6px 0;
-                border-radius: 10px;
-                border: 2px solid {theme_colors['btn_bg']};
-            }}
-            QSlider::groove:horizontal {{
-                background: {theme_colors['btn_bg']};
-                height: 12px;
-                border: 2px solid {theme_colors['btn_border']};
-            }}
-            QProgressBar {{
-                background-color: {theme_colors['btn_bg']};
-                border: 2px solid {theme_colors['btn_border']};
-                height: 12px;
-            }}
-            QProgressBar::chunk {{
-                background-color: {theme_colors['text_color']};
-            }}
-            QListWidget {{
-                background-color: {theme_colors['bg_color']};
-                color: {theme_colors['text_color']};
-                border: 2px solid {theme_colors['btn_border']};
-                font-family: 'VT323', monospace;
-                font-size: 16px;
-            }}
-        """)
+        self.setStyleSheet(self._compiled_styles.get(theme, self._compiled_styles["80s_neon"]))
 
     def init_ui(self):
         central_widget = QWidget()
@@ -234,104 +635,130 @@ class RetroMusicPlayer(QMainWindow):
             
     def dropEvent(self, event: QDropEvent):
         urls = [u.toLocalFile() for u in event.mimeData().urls()]
-        for url in urls:
-            file_ext = os.path.splitext(url)[1].lower()
-            if file_ext in self.SUPPORTED_FORMATS:
-                try:
-                    self.playlist.append(url)
-                    track_name = self.get_track_metadata(url)
-                    total_length = MP3(url).info.length if file_ext == '.mp3' else 0
-                    self.playlist_widget.addItem(f"{track_name} ({int(total_length)}s)")
-                    self.update_album_art(url)
-                except Exception as e:
-                    logging.error(f"Drop error for {url}: {str(e)}")
-                    QMessageBox.warning(self, "File Error", f"Could not load {os.path.basename(url)}: {str(e)}")
-            else:
-                QMessageBox.warning(self, "Unsupported Format", f"The file {os.path.basename(url)} is not supported.")
+        self._enqueue_tracks(self._filter_supported(urls))
         
     def adjust_volume(self, value):
-        pygame.mixer.music.set_volume(value / 100.0)
+        self._backend.set_volume(value / 100.0)
         
     def update_progress(self):
-        if pygame.mixer.music.get_busy():
-            current_pos = pygame.mixer.music.get_pos() / 1000
+        if self._backend.get_busy():
+            pos = self._backend.get_pos()
             try:
-                if self.playlist and self.current_track_index < len(self.playlist):
-                    total_length = MP3(self.playlist[self.current_track_index]).info.length
-                    progress = int((current_pos / total_length) * 100) if total_length > 0 else 0
-                    self.progress_bar.setValue(progress)
-                    self.track_label.setText(f"{self.get_track_metadata(self.playlist[self.current_track_index])} ({int(current_pos)}/{int(total_length)}s)")
+                self.progress_bar.setValue(int(pos * 100 / self._cur_length) if self._cur_length > 0 else 0)
+                self.track_label.setText(f"{self._cur_title} ({int(pos)}/{self._cur_total_str})")
             except Exception as e:
                 logging.error(f"Progress update error: {str(e)}")
                 pass
         
     def seek_to_position(self, event):
-        if self.playlist and self.current_track_index < len(self.playlist):
-            total_length = MP3(self.playlist[self.current_track_index]).info.length
+        # Without a known length a click would map to 0s and restart the track
+        if self.playlist and self.current_track_index < len(self.playlist) and self._cur_length > 0:
             click_pos = event.pos().x() / self.progress_bar.width()
-            new_pos = click_pos * total_length
-            pygame.mixer.music.set_pos(new_pos)
+            new_pos = click_pos * self._cur_length
+            self._backend.set_pos(new_pos)
             self.update_progress()
         
     def update_equalizer(self):
-        bars = ["█" if random.random() > 0.3 else " " for _ in range(5)]
-        self.equalizer_label.setText(f"Equalizer: [{''.join(bars)}]")
+        mask = self._rng.random(5) > 0.3
+        eq_str = "Equalizer: [" + "".join("█" if m else " " for m in mask) + "]"
+        if eq_str != self._last_eq_str:
+            self._last_eq_str = eq_str
+            self.equalizer_label.setText(eq_str)
         
     def adjust_equalizer(self):
-        # Placeholder for actual equalizer adjustment
-        bass = self.bass_slider.value() / 12.0
-        mid = self.mid_slider.value() / 12.0
-        treble = self.treble_slider.value() / 12.0
-        print(f"Equalizer: Bass={bass}, Mid={mid}, Treble={treble}")
+        self._eq_debounce.start()
+
+    def _apply_eq(self):
+        # Slider values are band gains in dB
+        self._backend.set_eq(self.bass_slider.value(), self.mid_slider.value(), self.treble_slider.value())
         
     def add_tracks(self):
-        supported_formats_str = " ".join([f"*{fmt}" for fmt in self.SUPPORTED_FORMATS])
         files, _ = QFileDialog.getOpenFileNames(
-            self, "Add Music Files", "", f"Audio Files ({supported_formats_str})"
+            self, "Add Music Files", "", self._FORMATS_FILTER
         )
+        self._enqueue_tracks(self._filter_supported(files))
+
+    def _filter_supported(self, files):
+        supported = []
         for file in files:
             file_ext = os.path.splitext(file)[1].lower()
             if file_ext in self.SUPPORTED_FORMATS:
-                try:
-                    self.playlist.append(file)
-                    track_name = self.get_track_metadata(file)
-                    total_length = MP3(file).info.length if file_ext == '.mp3' else 0
-                    self.playlist_widget.addItem(f"{track_name} ({int(total_length)}s)")
-                    self.update_album_art(file)
-                except Exception as e:
-                    logging.error(f"Add track error for {file}: {str(e)}")
-                    QMessageBox.warning(self, "File Error", f"Could not load {os.path.basename(file)}: {str(e)}")
+                supported.append(file)
             else:
                 QMessageBox.warning(self, "Unsupported Format", f"The file {os.path.basename(file)} is not supported.")
+        return supported
         
     def get_track_metadata(self, file):
+        try:
+            return _read_title(file, os.path.getmtime(file))
+        except Exception as e:
+            logging.error(f"Metadata error for {file}: {str(e)}")
+            return os.path.basename(file)
+
+    def _read_meta(self, file):
+        # Runs on pool threads as well as the GUI thread, so it must not touch widgets
+        meta = {'length': 0, 'title': self.get_track_metadata(file), 'art': None}
         try:
             ext = os.path.splitext(file)[1].lower()
             if ext == '.mp3':
-                audio = EasyID3(file)
-                return audio.get('title', [os.path.basename(file)])[0]
-            elif ext == '.flac':
-                audio = FLAC(file)
-                return audio.get('title', [os.path.basename(file)])[0]
-            elif ext == '.ogg':
-                audio = OggVorbis(file)
-                return audio.get('title', [os.path.basename(file)])[0]
-            return os.path.basename(file)
+                audio = MP3(file)
+                meta['length'] = audio.info.length
+                if audio.tags and 'APIC:' in audio.tags:
+                    # QImage (unlike QPixmap) is safe to decode and scale off the GUI thread
+                    image = QImage.fromData(audio.tags.getall('APIC:')[0].data)
+                    if not image.isNull():
+                        meta['art'] = image.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            else:
+                # Covers FLAC and Ogg as well as WAV, AIFF, Opus, M4A and the rest
+                audio = mutagen.File(file)
+                if audio is not None:
+                    meta['length'] = audio.info.length
         except Exception as e:
             logging.error(f"Metadata error for {file}: {str(e)}")
-            return os.path.basename(file)
+        return meta
+
+    def _load_meta(self, file):
+        # Parse the file once; progress ticks and seeks only read the cached values
+        meta = self._read_meta(file)
+        self._meta_cache[file] = meta
+        return meta
+
+    def _enqueue_tracks(self, files):
+        # One addItems call instead of a model insert + relayout per file
+        rows = []
+        pending = []
+        for row, file in enumerate(files, start=len(self.playlist)):
+            meta = self._meta_cache.get(file)
+            if meta:
+                rows.append(f"{meta['title']} ({int(meta['length'])}s)")
+            else:
+                rows.append(f"{os.path.basename(file)} (loading…)")
+                if file not in self._pending_rows:
+                    pending.append(file)
+                self._pending_rows.setdefault(file, []).append(row)
+        self.playlist.extend(files)
+        self.playlist_widget.addItems(rows)
+        for file in pending:
+            QThreadPool.globalInstance().start(MetaWorker(file, self._read_meta, self._meta_signals))
+
+    def _on_meta_loaded(self, path, length, title, art):
+        self._meta_cache[path] = {'length': length, 'title': title, 'art': art}
+        for row in self._pending_rows.pop(path, []):
+            self.playlist_widget.item(row).setText(f"{title} ({int(length)}s)")
+        if self.current_track_index < len(self.playlist) and self.playlist[self.current_track_index] == path:
+            self.update_album_art(path)
         
     def update_album_art(self, file):
         try:
-            if file.lower().endswith('.mp3'):
-                audio = MP3(file)
-                if audio.tags and 'APIC:' in audio.tags:
-                    apic = audio.tags.getall('APIC:')[0]
-                    pixmap = QPixmap()
-                    pixmap.loadFromData(apic.data)
-                    self.art_label.setPixmap(pixmap.scaled(200, 200, Qt.KeepAspectRatio, Qt.SmoothTransformation))
-                else:
-                    self.art_label.clear()
+            pixmap = QPixmapCache.find(file)
+            if pixmap is not None and not pixmap.isNull():
+                self.art_label.setPixmap(pixmap)
+                return
+            meta = self._meta_cache.get(file) or self._load_meta(file)
+            if meta['art'] is not None:
+                pixmap = QPixmap.fromImage(meta['art'])
+                QPixmapCache.insert(file, pixmap)
+                self.art_label.setPixmap(pixmap)
             else:
                 self.art_label.clear()
         except Exception as e:
@@ -346,44 +773,61 @@ class RetroMusicPlayer(QMainWindow):
         if self.playlist:
             track = self.playlist[self.current_track_index]
             try:
-                if self.is_playing:
-                    mixer.music.fadeout(int(self.crossfade_duration * 1000))
-                mixer.music.load(track)
-                mixer.music.play()
-                track_name = self.get_track_metadata(track)
+                crossfading = (self.is_playing and self._backend is self._stream_backend
+                               and self._stream_backend.crossfade_to(track, self.crossfade_duration))
+                if not crossfading:
+                    self._open_backend(track)
+                    self._backend.play()
+                meta = self._meta_cache.get(track) or self._load_meta(track)
+                self._cur_length = meta['length']
+                self._cur_title = meta['title']
+                self._cur_total_str = f"{int(self._cur_length)}s"
                 self.update_album_art(track)
                 self.play_btn.setText("⏸ Pause")
                 self.is_playing = True
                 self.progress_timer.start(1000)
-                self.equalizer_timer.start(100)
-                self.visualizer_timer.start(50)  # Start visualizer when playing
+                self.equalizer_timer.start(self.EQUALIZER_INTERVAL_MS)
+                self.visualizer_timer.start(self.VISUALIZER_INTERVAL_MS)  # Start visualizer when playing
             except Exception as e:
                 logging.error(f"Playback error for {track}: {str(e)}")
                 QMessageBox.critical(self, "Playback Error", f"Could not play {os.path.basename(track)}: {str(e)}")
         
+    def _open_backend(self, track):
+        self._backend.stop()
+        try:
+            self._stream_backend.load(track)
+            self._backend = self._stream_backend
+        except Exception as e:
+            # libsndfile can't decode every format we accept; pygame plays those without EQ
+            logging.error(f"Stream backend unavailable for {track}, falling back to pygame: {str(e)}")
+            self._pygame_backend.load(track)
+            self._backend = self._pygame_backend
+        self.adjust_volume(self.volume_slider.value())
+        self._apply_eq()
+
     def toggle_play(self):
         if self.is_playing:
-            pygame.mixer.music.pause()
+            self._backend.pause()
             self.play_btn.setText("▶ Play")
             self.is_playing = False
             self.progress_timer.stop()
             self.equalizer_timer.stop()
             self.visualizer_timer.stop()
         else:
-            pygame.mixer.music.unpause()
+            self._backend.unpause()
             self.play_btn.setText("⏸ Pause")
             self.is_playing = True
             self.progress_timer.start(1000)
-            self.equalizer_timer.start(100)
-            self.visualizer_timer.start(50)
+            self.equalizer_timer.start(self.EQUALIZER_INTERVAL_MS)
+            self.visualizer_timer.start(self.VISUALIZER_INTERVAL_MS)
         
     def next_track(self):
         if self.playlist:
             if self.is_shuffled:
-                self.current_track_index = random.randint(0, len(self.playlist) - 1)
+                self.current_track_index = self._shuffle_step(1)
             else:
                 self.current_track_index = (self.current_track_index + 1) % len(self.playlist)
-            if not self.is_repeated and self.current_track_index == 0 and pygame.mixer.music.get_pos() == -1:
+            if not self.is_repeated and self.current_track_index == 0 and self._backend.is_idle():
                 self.toggle_play()
             else:
                 self.play_track()
@@ -391,14 +835,47 @@ class RetroMusicPlayer(QMainWindow):
     def prev_track(self):
         if self.playlist:
             if self.is_shuffled:
-                self.current_track_index = random.randint(0, len(self.playlist) - 1)
+                self.current_track_index = self._shuffle_step(-1)
             else:
                 self.current_track_index = (self.current_track_index - 1) % len(self.playlist)
             self.play_track()
         
     def toggle_shuffle(self):
         self.is_shuffled = not self.is_shuffled
+        if self.is_shuffled:
+            self._reshuffle()
         self.shuffle_btn.setText("🔀 Shuffle" if not self.is_shuffled else "🔀 Unshuffle")
+
+    def _reshuffle(self):
+        order = list(range(len(self.playlist)))
+        random.shuffle(order)
+        # Start the walk from the current track so the next step never replays it
+        if self.current_track_index < len(order):
+            order.remove(self.current_track_index)
+            order.insert(0, self.current_track_index)
+        self._shuffle_order = order
+        self._shuffle_idx = 0
+
+    def _shuffle_step(self, step):
+        if len(self._shuffle_order) != len(self.playlist) or self.current_track_index >= len(self.playlist):
+            # Tracks were added or a playlist was loaded since the last shuffle
+            self._reshuffle()
+        elif self._shuffle_order[self._shuffle_idx] != self.current_track_index:
+            # A track was picked directly (e.g. double-click); continue the walk from it
+            self._shuffle_idx = self._shuffle_order.index(self.current_track_index)
+        order = self._shuffle_order
+        if step > 0:
+            self._shuffle_idx += 1
+            if self._shuffle_idx >= len(order):
+                # Every track has played once; start a fresh permutation
+                self._reshuffle()
+                self._shuffle_idx = 1 % len(self._shuffle_order)
+        elif self._shuffle_idx > 0:
+            self._shuffle_idx -= 1
+        else:
+            # Stepping back from the start: rotate the last entry to the front so Next comes back here
+            order.insert(0, order.pop())
+        return self._shuffle_order[self._shuffle_idx]
         
     def toggle_repeat(self):
         self.is_repeated = not self.is_repeated
@@ -419,13 +896,21 @@ class RetroMusicPlayer(QMainWindow):
         if file_path:
             try:
                 with open(file_path, 'r') as f:
-                    self.playlist = json.load(f)
+                    tracks = json.load(f)
+                found, missing = [], []
+                for track in tracks:
+                    (found if os.path.isfile(track) else missing).append(track)
+                self.playlist = []
+                self._pending_rows.clear()
                 self.playlist_widget.clear()
-                for track in self.playlist:
-                    track_name = self.get_track_metadata(track)
-                    total_length = MP3(track).info.length if track.lower().endswith('.mp3') else 0
-                    self.playlist_widget.addItem(f"{track_name} ({int(total_length)}s)")
-                QMessageBox.information(self, "Success", "Playlist loaded successfully.")
+                # Rows appear immediately; durations and titles are filled in by MetaWorkers
+                self._enqueue_tracks(found)
+                if missing:
+                    names = "\n".join(os.path.basename(track) for track in missing)
+                    QMessageBox.warning(self, "Missing Tracks",
+                                        f"Playlist loaded, but {len(missing)} track(s) could not be found:\n{names}")
+                else:
+                    QMessageBox.information(self, "Success", "Playlist loaded successfully.")
             except Exception as e:
                 logging.error(f"Load playlist error: {str(e)}")
                 QMessageBox.critical(self, "Load Error", f"Could not load playlist: {str(e)}")
@@ -433,17 +918,37 @@ class RetroMusicPlayer(QMainWindow):
     def update_visualizer(self):
         if self.is_playing:
             # Simulate amplitude with random values (placeholder)
-            bars = [max(1, int(random.uniform(1, 10))) for _ in range(8)]
-            visualizer_text = " ".join([f"█" * bar for bar in bars])
-            self.visualizer_label.setText(f"Visualizer: {visualizer_text}")
+            heights = self._rng.integers(1, 10, size=8)
+            vis_str = "Visualizer: " + " ".join(self._bar_strings[h] for h in heights)
         else:
-            self.visualizer_label.setText("Visualizer: [   ]")
+            vis_str = "Visualizer: [   ]"
+        if vis_str != self._last_vis_str:
+            self._last_vis_str = vis_str
+            self.visualizer_label.setText(vis_str)
+
+    def changeEvent(self, event):
+        # Nobody can see the bars while minimized, so don't spend repaints on them
+        if event.type() == QEvent.WindowStateChange:
+            if self.isMinimized():
+                self.equalizer_timer.stop()
+                self.visualizer_timer.stop()
+            elif self.is_playing:
+                self.equalizer_timer.start(self.EQUALIZER_INTERVAL_MS)
+                self.visualizer_timer.start(self.VISUALIZER_INTERVAL_MS)
+        super().changeEvent(event)
+
+    def closeEvent(self, event):
+        self._backend.stop()
+        super().closeEvent(event)
 
 def main():
+    _log_listener.start()
     app = QApplication(sys.argv)
     player = RetroMusicPlayer()
     player.show()
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    _log_listener.stop()
+    sys.exit(exit_code)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file